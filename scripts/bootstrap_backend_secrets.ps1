@@ -33,23 +33,22 @@ function Set-SecretFromEnv {
         throw "Missing value for secret $SecretId (empty). Set it on the Lambda first, then rerun bootstrap."
     }
 
-    # "describe-secret" failure is expected for first-time bootstrap; keep output quiet.
-    $exists = $false
-    try {
-        & $aws secretsmanager describe-secret --region $Region --secret-id $SecretId 2>$null | Out-Null
-        if ($LASTEXITCODE -eq 0) { $exists = $true }
-    } catch {
-        $exists = $false
-    }
-
-    if ($exists) {
-        Invoke-Aws -Args @(
-            "secretsmanager", "put-secret-value",
-            "--region", $Region,
-            "--secret-id", $SecretId,
-            "--secret-string", $Value
-        ) | Out-Null
-    } else {
+    # Try the update first: on re-deploys every secret already exists, so this
+    # saves an aws.exe launch per secret. Only a missing secret (first-time
+    # bootstrap) falls back to create-secret; any other failure (AccessDenied,
+    # throttling, network) is reported as-is.
+    # Native stderr would throw on its first line under "Stop"; relax it while
+    # capturing the output.
+    $ErrorActionPreference = "Continue"
+    $putOutput = & $aws secretsmanager put-secret-value --region $Region --secret-id $SecretId --secret-string $Value 2>&1
+    $putExitCode = $LASTEXITCODE
+    $ErrorActionPreference = "Stop"
+
+    if ($putExitCode -ne 0) {
+        $putError = ($putOutput | Out-String).Trim()
+        if ($putError -notmatch "ResourceNotFoundException") {
+            throw ("aws.exe failed: secretsmanager put-secret-value --secret-id " + $SecretId + "`n" + $putError)
+        }
         Invoke-Aws -Args @(
             "secretsmanager", "create-secret",
             "--region", $Region,
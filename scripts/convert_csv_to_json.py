@@ -7,167 +7,235 @@ Outputs to: src/data/
 
 import csv
 import json
+import math
 import os
 from pathlib import Path
 
+# orjson is optional; it serializes the (large) plants table much faster.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Get project root (parent of scripts folder)
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 OUTPUT_DIR = PROJECT_ROOT / "src" / "data"
 
-def convert_value(value, field_type="auto"):
-    """Convert string value to appropriate type."""
-    if value == "" or value is None:
+# Large enough that each output file reaches the OS in a single write.
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Per-column converters. Each schema below names the converter for its column,
+# so cells are not type-sniffed at runtime. Empty cells become None; a cell
+# that does not parse is kept as text rather than dropped.
+def float_value(value):
+    """Parse a decimal CSV cell."""
+    if not value:
         return None
-    
-    # Boolean fields
-    if value.lower() in ("yes", "true", "1"):
-        return True
-    if value.lower() in ("no", "false", "0"):
-        return False
-    
-    # Try numeric conversion
     try:
-        if "." in value:
-            return float(value)
-        return int(value)
+        number = float(value)
     except ValueError:
         return value
+    # float() also accepts "nan"/"inf", which have no JSON form; keep those as text.
+    return number if math.isfinite(number) else value
+
+def int_value(value):
+    """Parse an integer CSV cell (a decimal value is kept as a float)."""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return float_value(value)
+
+def id_value(value):
+    """Parse an id CSV cell; an absent id column reads as 0, as row.get(col, 0) did."""
+    return int(value) if value else 0
+
+def text_value(value):
+    """Pass a CSV cell through unchanged."""
+    return value
+
+def yes_flag(value):
+    """Map a Yes/No CSV cell to a boolean."""
+    return value == "Yes"
+
+# Output schemas: (JSON key, CSV column, converter). Order is the JSON key order.
+PLANT_FIELDS = (
+    ("subtype", "subtype", text_value),
+    ("category", "category", text_value),
+    ("common_name_ro", "common_name_ro", text_value),
+    ("common_name_en", "common_name_en", text_value),
+    ("scientific_name", "scientific_name", text_value),
+    ("indoor_ok", "indoor_ok", yes_flag),
+    ("toxic_flag", "toxic_flag", yes_flag),
+    ("edible_part", "edible_part", text_value),
+    ("primary_use", "primary_use", text_value),
+    ("fertility_need", "fertility_need", text_value),
+    ("pruning_need", "pruning_need", text_value),
+    ("growth_rate", "growth_rate", text_value),
+    # FAO-56 Crop Coefficients
+    ("kc_ini", "kc_ini", float_value),
+    ("kc_mid", "kc_mid", float_value),
+    ("kc_end", "kc_end", float_value),
+    ("kc_dev", "kc_dev", float_value),
+    # Root depth
+    ("root_depth_min_m", "root_depth_min_m", float_value),
+    ("root_depth_max_m", "root_depth_max_m", float_value),
+    # Depletion
+    ("depletion_fraction_p", "depletion_fraction_p", float_value),
+    ("allowable_depletion_pct", "allowable_depletion_pct", int_value),
+    # Growth stages (days)
+    ("stage_days_ini", "stage_days_ini", int_value),
+    ("stage_days_dev", "stage_days_dev", int_value),
+    ("stage_days_mid", "stage_days_mid", int_value),
+    ("stage_days_end", "stage_days_end", int_value),
+    # Growth cycle info
+    ("growth_cycle", "growth_cycle", text_value),
+    ("maturity_days_min", "maturity_days_min", int_value),
+    ("maturity_days_max", "maturity_days_max", int_value),
+    ("juvenile_years_to_bearing", "juvenile_years_to_bearing", int_value),
+    # Spacing
+    ("spacing_row_m", "spacing_row_m", float_value),
+    ("spacing_plant_m", "spacing_plant_m", float_value),
+    ("default_density_plants_m2", "default_density_plants_m2", float_value),
+    ("canopy_cover_max_frac", "canopy_cover_max_frac", float_value),
+    # Tolerances
+    ("shade_tolerance", "shade_tolerance", text_value),
+    ("drought_tolerance", "drought_tolerance", text_value),
+    ("salinity_tolerance", "salinity_tolerance", text_value),
+    # Irrigation
+    ("typ_irrig_method", "typ_irrig_method", text_value),
+    # Source tags
+    ("kc_source_tag", "kc_source_tag", text_value),
+    ("root_depth_source", "root_depth_source", text_value),
+    ("water_stress_sensitive_stage", "water_stress_sensitive_stage", text_value),
+    # pH and temperature
+    ("ph_min", "ph_min", float_value),
+    ("ph_max", "ph_max", float_value),
+    ("frost_tolerance_c", "frost_tolerance_c", int_value),
+    ("temp_opt_min_c", "temp_opt_min_c", int_value),
+    ("temp_opt_max_c", "temp_opt_max_c", int_value),
+)
+
+SOIL_FIELDS = (
+    ("id", "soil_id", id_value),
+    ("soil_type", "soil_type", text_value),
+    ("texture", "texture", text_value),
+    ("field_capacity_pct", "fc_pctvol", int_value),
+    ("wilting_point_pct", "pwp_pctvol", int_value),
+    ("available_water_mm_m", "awc_mm_per_m", int_value),
+    ("infiltration_rate_mm_h", "infil_mm_h", int_value),
+    ("p_raw", "p_raw", float_value),
+)
+
+IRRIGATION_METHOD_FIELDS = (
+    ("id", "method_id", id_value),
+    ("name", "method_name", text_value),
+    ("code_enum", "code_enum", text_value),
+    ("efficiency_pct", "efficiency_pct", int_value),
+    ("infiltration_style", "infiltration_style", text_value),
+    ("wetting_fraction", "wetting_fraction", float_value),
+    ("depth_typical_mm", "depth_typical_mm", text_value),
+    ("application_rate_mm_h", "application_rate_mm_h", text_value),
+    ("distribution_uniformity_pct", "distribution_uniformity_pct", int_value),
+    ("compatible_soil_textures", "compatible_soil_textures", text_value),
+    ("recommended_for", "recommended_for", text_value),
+    ("notes", "notes", text_value),
+)
+
+def dump_record(record):
+    """Serialize one record as 2-space indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    return json.dumps(record, ensure_ascii=False, indent=2).encode("utf-8")
+
+def write_json(output_file, records):
+    """Stream records to output_file as an indented JSON array; return the count.
+
+    Records are serialized one at a time, so the caller can pass a generator
+    and never hold the whole table in memory. The layout matches
+    json.dump(records, indent=2).
+    """
+    count = 0
+    with open(output_file, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        for record in records:
+            f.write(b",\n  " if count else b"[\n  ")
+            # JSON strings never contain raw newlines, so this only re-indents structure.
+            f.write(dump_record(record).replace(b"\n", b"\n  "))
+            count += 1
+        f.write(b"\n]" if count else b"[]")
+    return count
+
+def read_records(reader, fields, index_key=None):
+    """Yield one record per csv.reader row using a field schema.
+
+    Schema columns are resolved to positions once from the header, so each
+    row is indexed by integer. Missing columns read as "" and cells missing
+    from short rows as None, the same values csv.DictReader + row.get(col, "")
+    produced. With index_key, the 0-based row number is stored first under
+    that key.
+    """
+    header = next(reader, [])
+    width = len(header)
+    positions = {name: i for i, name in enumerate(header)}
+    # Absent columns point at the "" cell appended past the end of every row.
+    columns = [(key, positions.get(column, width), convert) for key, column, convert in fields]
+    # Copying a pre-sized template is cheaper than growing a fresh dict per row.
+    keys = [key for key, _, _ in fields]
+    template = dict.fromkeys([index_key, *keys] if index_key is not None else keys)
+    index = 0
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row.extend([None] * (width - len(row)))
+        elif len(row) > width:
+            del row[width:]
+        row.append("")
+        record = template.copy()
+        if index_key is not None:
+            record[index_key] = index
+        for key, i, convert in columns:
+            record[key] = convert(row[i])
+        index += 1
+        yield record
 
 def convert_plants():
     """Convert plants_full.csv to plants.json"""
     input_file = PROJECT_ROOT / "plants_full.csv"
     output_file = OUTPUT_DIR / "plants.json"
     
-    plants = []
-    
     with open(input_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for idx, row in enumerate(reader):
-            plant = {
-                "id": idx,
-                "subtype": row.get("subtype", ""),
-                "category": row.get("category", ""),
-                "common_name_ro": row.get("common_name_ro", ""),
-                "common_name_en": row.get("common_name_en", ""),
-                "scientific_name": row.get("scientific_name", ""),
-                "indoor_ok": row.get("indoor_ok", "No") == "Yes",
-                "toxic_flag": row.get("toxic_flag", "No") == "Yes",
-                "edible_part": row.get("edible_part", ""),
-                "primary_use": row.get("primary_use", ""),
-                "fertility_need": row.get("fertility_need", ""),
-                "pruning_need": row.get("pruning_need", ""),
-                "growth_rate": row.get("growth_rate", ""),
-                # FAO-56 Crop Coefficients
-                "kc_ini": convert_value(row.get("kc_ini", "")),
-                "kc_mid": convert_value(row.get("kc_mid", "")),
-                "kc_end": convert_value(row.get("kc_end", "")),
-                "kc_dev": convert_value(row.get("kc_dev", "")),
-                # Root depth
-                "root_depth_min_m": convert_value(row.get("root_depth_min_m", "")),
-                "root_depth_max_m": convert_value(row.get("root_depth_max_m", "")),
-                # Depletion
-                "depletion_fraction_p": convert_value(row.get("depletion_fraction_p", "")),
-                "allowable_depletion_pct": convert_value(row.get("allowable_depletion_pct", "")),
-                # Growth stages (days)
-                "stage_days_ini": convert_value(row.get("stage_days_ini", "")),
-                "stage_days_dev": convert_value(row.get("stage_days_dev", "")),
-                "stage_days_mid": convert_value(row.get("stage_days_mid", "")),
-                "stage_days_end": convert_value(row.get("stage_days_end", "")),
-                # Growth cycle info
-                "growth_cycle": row.get("growth_cycle", ""),
-                "maturity_days_min": convert_value(row.get("maturity_days_min", "")),
-                "maturity_days_max": convert_value(row.get("maturity_days_max", "")),
-                "juvenile_years_to_bearing": convert_value(row.get("juvenile_years_to_bearing", "")),
-                # Spacing
-                "spacing_row_m": convert_value(row.get("spacing_row_m", "")),
-                "spacing_plant_m": convert_value(row.get("spacing_plant_m", "")),
-                "default_density_plants_m2": convert_value(row.get("default_density_plants_m2", "")),
-                "canopy_cover_max_frac": convert_value(row.get("canopy_cover_max_frac", "")),
-                # Tolerances
-                "shade_tolerance": row.get("shade_tolerance", ""),
-                "drought_tolerance": row.get("drought_tolerance", ""),
-                "salinity_tolerance": row.get("salinity_tolerance", ""),
-                # Irrigation
-                "typ_irrig_method": row.get("typ_irrig_method", ""),
-                # Source tags
-                "kc_source_tag": row.get("kc_source_tag", ""),
-                "root_depth_source": row.get("root_depth_source", ""),
-                "water_stress_sensitive_stage": row.get("water_stress_sensitive_stage", ""),
-                # pH and temperature
-                "ph_min": convert_value(row.get("ph_min", "")),
-                "ph_max": convert_value(row.get("ph_max", "")),
-                "frost_tolerance_c": convert_value(row.get("frost_tolerance_c", "")),
-                "temp_opt_min_c": convert_value(row.get("temp_opt_min_c", "")),
-                "temp_opt_max_c": convert_value(row.get("temp_opt_max_c", "")),
-            }
-            plants.append(plant)
-    
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(plants, f, ensure_ascii=False, indent=2)
+        plants = read_records(csv.reader(f), PLANT_FIELDS, index_key="id")
+        count = write_json(output_file, plants)
     
-    print(f"✓ Converted {len(plants)} plants to {output_file}")
-    return plants
+    print(f"✓ Converted {count} plants to {output_file}")
+    return count
 
 def convert_soils():
     """Convert soil_db_new.csv to soils.json"""
     input_file = PROJECT_ROOT / "soil_db_new.csv"
     output_file = OUTPUT_DIR / "soils.json"
     
-    soils = []
-    
     with open(input_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            soil = {
-                "id": int(row.get("soil_id", 0)),
-                "soil_type": row.get("soil_type", ""),
-                "texture": row.get("texture", ""),
-                "field_capacity_pct": convert_value(row.get("fc_pctvol", "")),
-                "wilting_point_pct": convert_value(row.get("pwp_pctvol", "")),
-                "available_water_mm_m": convert_value(row.get("awc_mm_per_m", "")),
-                "infiltration_rate_mm_h": convert_value(row.get("infil_mm_h", "")),
-                "p_raw": convert_value(row.get("p_raw", "")),
-            }
-            soils.append(soil)
+        soils = read_records(csv.reader(f), SOIL_FIELDS)
+        count = write_json(output_file, soils)
     
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(soils, f, ensure_ascii=False, indent=2)
-    
-    print(f"✓ Converted {len(soils)} soils to {output_file}")
-    return soils
+    print(f"✓ Converted {count} soils to {output_file}")
+    return count
 
 def convert_irrigation_methods():
     """Convert irrigation_methods.csv to irrigation_methods.json"""
     input_file = PROJECT_ROOT / "irrigation_methods.csv"
     output_file = OUTPUT_DIR / "irrigation_methods.json"
     
-    methods = []
-    
     with open(input_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            method = {
-                "id": int(row.get("method_id", 0)),
-                "name": row.get("method_name", ""),
-                "code_enum": row.get("code_enum", ""),
-                "efficiency_pct": convert_value(row.get("efficiency_pct", "")),
-                "infiltration_style": row.get("infiltration_style", ""),
-                "wetting_fraction": convert_value(row.get("wetting_fraction", "")),
-                "depth_typical_mm": row.get("depth_typical_mm", ""),
-                "application_rate_mm_h": row.get("application_rate_mm_h", ""),
-                "distribution_uniformity_pct": convert_value(row.get("distribution_uniformity_pct", "")),
-                "compatible_soil_textures": row.get("compatible_soil_textures", ""),
-                "recommended_for": row.get("recommended_for", ""),
-                "notes": row.get("notes", ""),
-            }
-            methods.append(method)
-    
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(methods, f, ensure_ascii=False, indent=2)
+        methods = read_records(csv.reader(f), IRRIGATION_METHOD_FIELDS)
+        count = write_json(output_file, methods)
     
-    print(f"✓ Converted {len(methods)} irrigation methods to {output_file}")
-    return methods
+    print(f"✓ Converted {count} irrigation methods to {output_file}")
+    return count
 
 def main():
     # Create output directory
@@ -177,16 +245,16 @@ def main():
     print(f"Output directory: {OUTPUT_DIR}")
     print()
     
-    plants = convert_plants()
-    soils = convert_soils()
-    methods = convert_irrigation_methods()
+    plant_count = convert_plants()
+    soil_count = convert_soils()
+    method_count = convert_irrigation_methods()
     
     print()
     print("=" * 50)
     print(f"Summary:")
-    print(f"  Plants: {len(plants)} entries")
-    print(f"  Soils: {len(soils)} entries")
-    print(f"  Irrigation Methods: {len(methods)} entries")
+    print(f"  Plants: {plant_count} entries")
+    print(f"  Soils: {soil_count} entries")
+    print(f"  Irrigation Methods: {method_count} entries")
     print("=" * 50)
     print("Done!")
 
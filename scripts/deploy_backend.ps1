@@ -2,7 +2,10 @@ param(
     [string]$StackName = "autowatering-backend-dev",
     [string]$Region = "eu-central-1",
     [string]$AppEnvironment = "dev",
-    [string]$BackendDir = "backend/aws-autowatering-backend"
+    [string]$BackendDir = "backend/aws-autowatering-backend",
+    [switch]$Parallel,
+    [switch]$Fast,
+    [switch]$ForceBuild
 )
 
 $ErrorActionPreference = "Stop"
@@ -24,21 +27,105 @@ function Invoke-Step {
     }
 }
 
-Invoke-Step -Label "Bootstrap backend secrets (Secrets Manager)" -Action {
-    powershell -NoProfile -ExecutionPolicy Bypass -File (Join-Path $PSScriptRoot "bootstrap_backend_secrets.ps1") `
-        -StackName $StackName `
-        -Region $Region `
-        -AppEnvironment $AppEnvironment
+function Get-TsSourceHash {
+    # Stable hash of the inputs to `npm run build`, relative to the backend dir:
+    # everything under src (not just .ts; JSON/JS/assets can be bundled too),
+    # package.json (the build script and its flags), the lockfile, and every
+    # top-level tsconfig*.json so a base config pulled in via "extends" counts.
+    $files = @()
+    if (Test-Path "src") {
+        $files = @(Get-ChildItem -Path "src" -Recurse -File | Sort-Object FullName)
+    }
+    $files += @(Get-ChildItem -Path "." -File -Filter "tsconfig*.json" | Sort-Object FullName)
+    foreach ($name in @("package.json", "package-lock.json")) {
+        if (Test-Path $name) { $files += Get-Item $name }
+    }
+
+    $entries = foreach ($file in $files) {
+        (Resolve-Path -Relative $file.FullName) + ":" + (Get-FileHash -Algorithm SHA256 -Path $file.FullName).Hash
+    }
+    $bytes = [System.Text.Encoding]::UTF8.GetBytes(($entries -join "`n"))
+    $sha = [System.Security.Cryptography.SHA256]::Create()
+    try {
+        return [System.BitConverter]::ToString($sha.ComputeHash($bytes)).Replace("-", "")
+    } finally {
+        $sha.Dispose()
+    }
+}
+
+# -Fast builds functions concurrently and reuses unchanged build artifacts;
+# leave it off for deterministic serial builds when debugging.
+$samBuildArgs = @("build")
+if ($Fast) {
+    $samBuildArgs += @("--parallel", "--cached")
+}
+
+$bootstrapLabel = "Bootstrap backend secrets (Secrets Manager)"
+# PowerShell 7 starts noticeably faster than Windows PowerShell 5.1; use it when installed.
+$bootstrapShell = "powershell"
+if (Get-Command "pwsh" -ErrorAction SilentlyContinue) {
+    $bootstrapShell = "pwsh"
+}
+$bootstrapArgs = @(
+    "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass",
+    "-File", (Join-Path $PSScriptRoot "bootstrap_backend_secrets.ps1"),
+    "-StackName", $StackName,
+    "-Region", $Region,
+    "-AppEnvironment", $AppEnvironment
+)
+$bootstrapJob = $null
+
+if ($Parallel) {
+    # The secrets bootstrap only talks to Secrets Manager, so it can overlap the
+    # TypeScript build. It is joined before SAM runs; its log is printed at the join.
+    Write-Host ("==> " + $bootstrapLabel + " (background)")
+    $bootstrapJob = Start-Job -ArgumentList $bootstrapShell, $bootstrapArgs -ScriptBlock {
+        param([string]$BootstrapShell, [string[]]$BootstrapArgs)
+        & $BootstrapShell @BootstrapArgs
+        if ($LASTEXITCODE -ne 0) {
+            throw "bootstrap_backend_secrets.ps1 exited with code $LASTEXITCODE"
+        }
+    }
+} else {
+    Invoke-Step -Label $bootstrapLabel -Action { & $bootstrapShell @bootstrapArgs }
 }
 
 Push-Location $BackendDir
 try {
-    Invoke-Step -Label "Backend TypeScript build" -Action { npm run build }
-    Invoke-Step -Label "SAM build" -Action { & $sam build }
+    # Skip the TypeScript build when its inputs match the last successful build.
+    $tsHash = Get-TsSourceHash
+    $tsMarker = Join-Path "dist" ".ts-build-hash"
+    $tsStoredHash = $null
+    if (Test-Path $tsMarker) {
+        # Get-Content -Raw returns $null for an empty file.
+        $tsStoredHash = Get-Content -Raw -Path $tsMarker
+    }
+    if (-not $ForceBuild -and $null -ne $tsStoredHash -and ($tsStoredHash.Trim() -eq $tsHash)) {
+        Write-Host "==> Backend TypeScript build (skipped: sources unchanged, use -ForceBuild to rebuild)"
+    } else {
+        # tsc still emits JS on type errors, so drop the marker first: it is only
+        # rewritten once this build succeeds from exactly these inputs.
+        Remove-Item $tsMarker -ErrorAction SilentlyContinue
+        Invoke-Step -Label "Backend TypeScript build" -Action { npm run build }
+        if (Test-Path "dist") {
+            Set-Content -Path $tsMarker -Value $tsHash -NoNewline
+        }
+    }
+    if ($bootstrapJob) {
+        Write-Host ("==> Waiting for: " + $bootstrapLabel)
+        Wait-Job -Job $bootstrapJob | Out-Null
+        Receive-Job -Job $bootstrapJob -ErrorAction Continue
+        if ($bootstrapJob.State -ne "Completed") {
+            throw ("Step failed: " + $bootstrapLabel)
+        }
+    }
+    Invoke-Step -Label "SAM build" -Action { & $sam @samBuildArgs }
     Invoke-Step -Label "SAM deploy" -Action { & $sam deploy }
 } finally {
+    if ($bootstrapJob) {
+        Remove-Job -Job $bootstrapJob -Force -ErrorAction SilentlyContinue
+    }
     Pop-Location
 }
 
 Write-Host "Deploy complete."
-
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import json
 import os
+import queue
+import re
+import shlex
 import shutil
 import socket
 import subprocess
@@ -19,37 +23,91 @@ try:
 except ImportError:
     HAS_WEBSOCKET = False
 
+# orjson is optional; it parses CDP frames straight from bytes, several times
+# faster than the stdlib module.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    load_json = orjson.loads
+    dump_json = orjson.dumps
+else:
+    load_json = json.loads
+
+    def dump_json(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    # Each shutil.which() walks every PATH entry; adb/npm/npx are looked up
+    # several times per run, and PATH does not change while we are running.
+    return shutil.which(name)
 
+
+@functools.lru_cache(maxsize=None)
 def resolve_cmd(name: str) -> str:
     if os.name == "nt":
         cmd = f"{name}.cmd"
-        if shutil.which(cmd):
+        if _which(cmd):
             return cmd
     return name
 
 
 def wait_for_port(host: str, port: int, timeout_s: float) -> bool:
-    start = time.time()
-    while time.time() - start < timeout_s:
-        try:
-            with socket.create_connection((host, port), timeout=1):
-                return True
-        except OSError:
-            time.sleep(0.5)
-    return False
+    # Poll quickly at first so a fast-starting server is seen within tens of ms,
+    # then back off to the old 0.5 s interval for slow starts.
+    # Try every address host resolves to (e.g. ::1 and 127.0.0.1 for localhost),
+    # so a server bound to only one family is found on the first attempt.
+    deadline = time.monotonic() + timeout_s
+    try:
+        addrs = [
+            (family, sockaddr)
+            for family, _, _, _, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        ]
+    except OSError:
+        addrs = [(socket.AF_INET, (host, port))]
+    delay = 0.025
+    while True:
+        for family, sockaddr in addrs:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                with socket.socket(family, socket.SOCK_STREAM) as s:
+                    s.settimeout(min(1.0, remaining))
+                    s.connect(sockaddr)
+                    return True
+            except OSError:
+                continue
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.5)
 
 
 def find_free_port(host: str, start_port: int, tries: int = 20) -> int:
-    """Find an available TCP port on host, starting from start_port."""
-    for port in range(start_port, start_port + max(1, tries)):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    """Find an available TCP port on host, starting from start_port.
+
+    Falls back to an OS-assigned port when the whole range is busy.
+    """
+    # A failed bind leaves the socket unbound, so one socket serves every attempt.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        for port in range(start_port, start_port + max(1, tries)):
             try:
                 s.bind((host, port))
                 return port
             except OSError:
                 continue
-    return start_port
+        try:
+            s.bind((host, 0))
+            return s.getsockname()[1]
+        except OSError:
+            return start_port
 
 
 def get_local_ipv4() -> Optional[str]:
@@ -73,17 +131,68 @@ def get_local_ipv4() -> Optional[str]:
     return None
 
 
+def _raw_stdout_fd() -> Optional[int]:
+    # A Windows console only renders UTF-8 through sys.stdout.buffer's console
+    # writer, so raw fd writes are POSIX-only.
+    if os.name == "nt":
+        return None
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+_STDOUT_FD = _raw_stdout_fd()
+
+
+def write_stdout(data: bytes):
+    """Write already-encoded output, bypassing the sys.stdout text layer."""
+    # Flush first so print() output from other threads stays in order.
+    sys.stdout.flush()
+    if _STDOUT_FD is None:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+        return
+    view = memoryview(data)
+    while view:
+        view = view[os.write(_STDOUT_FD, view):]
+
+
 def stream_output(proc: subprocess.Popen, prefix: str, line_filter=None):
     if proc.stdout is None:
         return None
+    prefix_bytes = prefix.encode("utf-8")
+
+    def emit(raw_lines):
+        batch = []
+        for raw in raw_lines:
+            # Filters see raw bytes, and lines are written through undecoded.
+            raw = raw.rstrip()
+            if line_filter is None or line_filter(raw):
+                batch.append(prefix_bytes)
+                batch.append(raw)
+                batch.append(b"\n")
+        if batch:
+            write_stdout(b"".join(batch))
 
     def pump():
+        pending = b""
         try:
-            for line in proc.stdout:
-                if not line:
-                    continue
-                if line_filter is None or line_filter(line):
-                    print(f"{prefix}{line.rstrip()}", flush=True)
+            while True:
+                # read1 returns everything already buffered (up to 64 KiB) as soon as
+                # any output is available, so a burst becomes one write and one flush
+                # instead of one per line, without delaying quiet streams.
+                chunk = proc.stdout.read1(65536)
+                if not chunk:
+                    break
+                lines = (pending + chunk).splitlines(keepends=True)
+                pending = b""
+                # Hold back a partial line, or a trailing "\r" whose "\n" may follow.
+                if lines and not lines[-1].endswith(b"\n"):
+                    pending = lines.pop()
+                emit(lines)
+            if pending:
+                emit([pending])
         except Exception as e:
             print(f"{prefix}Error reading stream: {e}", flush=True)
 
@@ -92,6 +201,22 @@ def stream_output(proc: subprocess.Popen, prefix: str, line_filter=None):
     return thread
 
 
+def watch_exit(proc: subprocess.Popen, prefix: str, shutting_down: threading.Event):
+    """Report proc's exit from a thread blocked in wait(), unless we are stopping it."""
+
+    def watcher():
+        returncode = proc.wait()
+        if not shutting_down.is_set():
+            print(
+                f"{prefix}process exited with code {returncode}; keeping wrapper alive.",
+                flush=True,
+            )
+
+    thread = threading.Thread(target=watcher, daemon=True)
+    thread.start()
+    return thread
+
+
 def _rmtree_onerror(func, path, exc_info):
     try:
         os.chmod(path, 0o666)
@@ -159,28 +284,60 @@ def read_app_id(project_root: Path) -> Optional[str]:
     if not config_path.exists():
         return None
     try:
-        data = json.loads(config_path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
+        data = load_json(config_path.read_bytes())
+    except (OSError, ValueError):
         return None
     return data.get("appId")
 
 
-def get_app_pid(adb_cmd: str, cwd: Path, app_id: str) -> Optional[int]:
+def adb_args(adb_cmd: str, target: Optional[str]) -> list:
+    cmd = [adb_cmd]
+    if target:
+        cmd.extend(["-s", target])
+    return cmd
+
+
+def adb_shell(
+    adb_cmd: str,
+    cwd: Path,
+    target: Optional[str],
+    args: list,
+    timeout_s: float = 10,
+) -> Optional[str]:
+    """Run `adb shell <args>`; return stdout or None."""
+    return adb_shell_batch(adb_cmd, cwd, target, [args], timeout_s)
+
+
+def adb_shell_batch(
+    adb_cmd: str,
+    cwd: Path,
+    target: Optional[str],
+    commands: list,
+    timeout_s: float = 10,
+) -> Optional[str]:
+    """Run several shell commands in one `adb shell` round trip; return their stdout or None."""
+    script = "; ".join(" ".join(shlex.quote(arg) for arg in args) for args in commands)
     try:
         result = subprocess.run(
-            [adb_cmd, "shell", "pidof", "-s", app_id],
+            adb_args(adb_cmd, target) + ["shell", script],
             cwd=cwd,
             check=False,
             capture_output=True,
             text=True,
-            timeout=10,
+            timeout=timeout_s,
         )
-    except subprocess.TimeoutExpired:
-        return None
-    except OSError:
+    except (subprocess.TimeoutExpired, OSError):
         return None
+    return result.stdout
 
-    pid_text = result.stdout.strip()
+
+def get_app_pid(
+    adb_cmd: str,
+    cwd: Path,
+    app_id: str,
+    target: Optional[str] = None,
+) -> Optional[int]:
+    pid_text = (adb_shell(adb_cmd, cwd, target, ["pidof", "-s", app_id]) or "").strip()
     if not pid_text:
         return None
     try:
@@ -189,18 +346,100 @@ def get_app_pid(adb_cmd: str, cwd: Path, app_id: str) -> Optional[int]:
         return None
 
 
-def wait_for_pid(adb_cmd: str, cwd: Path, app_id: str, timeout_s: int) -> Optional[int]:
-    deadline = time.time() + timeout_s
-    while time.time() < deadline:
-        pid = get_app_pid(adb_cmd, cwd, app_id)
-        if pid:
-            return pid
-        time.sleep(1)
-    return None
+# Windows cannot interrupt a blocking lock wait with Ctrl+C, so wait in slices there.
+_WAIT_SLICE_S = 0.5 if os.name == "nt" else None
+
+
+def wait_event(event: threading.Event, timeout_s: Optional[float] = None) -> bool:
+    """Event.wait() that still lets Ctrl+C through on Windows."""
+    if _WAIT_SLICE_S is None:
+        return event.wait(timeout_s)
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    while True:
+        remaining = _WAIT_SLICE_S
+        if deadline is not None:
+            remaining = min(remaining, deadline - time.monotonic())
+            if remaining <= 0:
+                return event.is_set()
+        if event.wait(remaining):
+            return True
+
+
+def wait_for_pid(
+    adb_cmd: str,
+    cwd: Path,
+    app_id: str,
+    timeout_s: int,
+    target: Optional[str] = None,
+    clear_events: bool = True,
+) -> Optional[int]:
+    """Wait for the app process to start and return its PID.
+
+    Subscribes to `am_proc_start` in the events log buffer, so the PID is
+    known as soon as the process is forked instead of polling `pidof` once a
+    second. If the events stream cannot be read or ends early, falls back to
+    polling `pidof` until the same deadline.
+    Pass clear_events=False if the caller already emptied the events buffer.
+    """
+    deadline = time.monotonic() + timeout_s
+
+    def poll_pid() -> Optional[int]:
+        while True:
+            pid = get_app_pid(adb_cmd, cwd, app_id, target)
+            remaining = deadline - time.monotonic()
+            if pid or remaining <= 0:
+                return pid
+            time.sleep(min(1.0, remaining))
+
+    # An old am_proc_start entry would report a stale PID; start from an empty buffer.
+    if clear_events:
+        adb_shell(adb_cmd, cwd, target, ["logcat", "-b", "events", "-c"])
+    try:
+        events_proc = subprocess.Popen(
+            adb_args(adb_cmd, target) + ["logcat", "-b", "events", "-v", "raw", "am_proc_start:I", "*:S"],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return poll_pid()
+
+    # am_proc_start: [user, pid, uid, process name, type, component]
+    proc_start_re = re.compile(rb"\[\d+,(\d+),\d+," + re.escape(app_id.encode()) + rb"[,\]]")
+    result = {"pid": None}
+    started = threading.Event()
+
+    def read_events():
+        try:
+            for line in events_proc.stdout:
+                match = proc_start_re.search(line)
+                if match:
+                    result["pid"] = int(match.group(1))
+                    break
+        except (OSError, ValueError):
+            pass
+        started.set()
+
+    threading.Thread(target=read_events, daemon=True).start()
+    try:
+        wait_event(started, max(0.0, deadline - time.monotonic()))
+    finally:
+        events_proc.terminate()
+        try:
+            events_proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            events_proc.kill()
 
+    if result["pid"]:
+        return result["pid"]
+    return poll_pid()
 
-def parse_threadtime_pid(line: str) -> Optional[int]:
-    parts = line.split()
+
+def parse_threadtime_pid(line: bytes) -> Optional[int]:
+    # threadtime: "DATE TIME PID TID LEVEL TAG: MSG". Stop after the fifth field
+    # so the message is never split word by word; len(parts) < 5 still means
+    # the line has fewer than five fields.
+    parts = line.split(None, 4)
     if len(parts) < 5:
         return None
     try:
@@ -209,23 +448,26 @@ def parse_threadtime_pid(line: str) -> Optional[int]:
         return None
 
 
-def is_console_line(line: str) -> bool:
-    upper = line.upper()
-    # Broad filter to catch all potential web/app logs
-    # CAPACITOR: Standard Capacitor logs
-    # CHROMIUM: WebView internal logs
-    # CONSOLE: Generic console logs
-    # WEBVIEW: Some devices use this
-    return any(tag in upper for tag in [
-        "CAPACITOR", "CHROMIUM", "CONSOLE", "WEBVIEW", "SYSTEMWEBCHROMECLIENT"
-    ])
+# Broad filter to catch all potential web/app logs
+# CAPACITOR: Standard Capacitor logs
+# CHROMIUM: WebView internal logs
+# CONSOLE: Generic console logs
+# WEBVIEW: Some devices use this
+_CONSOLE_TAG_RE = re.compile(
+    rb"CAPACITOR|CHROMIUM|CONSOLE|WEBVIEW|SYSTEMWEBCHROMECLIENT", re.IGNORECASE
+)
+
+
+def is_console_line(line: bytes) -> bool:
+    # One case-insensitive scan, without upper-casing a copy of the line.
+    return _CONSOLE_TAG_RE.search(line) is not None
 
 
 def get_cdp_websocket_url(port: int = 9222) -> Optional[str]:
     """Get the WebSocket URL for Chrome DevTools Protocol."""
     try:
         with urllib.request.urlopen(f"http://localhost:{port}/json", timeout=5) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+            data = load_json(resp.read())
             for target in data:
                 if target.get("type") == "page":
                     return target.get("webSocketDebuggerUrl")
@@ -234,21 +476,113 @@ def get_cdp_websocket_url(port: int = 9222) -> Optional[str]:
     return None
 
 
-def start_cdp_console_stream(adb_cmd: str, cwd: Path, target: Optional[str]):
-    """Start streaming console logs via Chrome DevTools Protocol."""
-    if not HAS_WEBSOCKET:
-        print("Warning: websocket-client not installed. Run: pip install websocket-client")
-        return None
+def _format_cdp_value(arg: dict) -> str:
+    val = arg.get("value")
+    return str(val) if val is not None else str(arg)
 
-    # Set up port forwarding for CDP
-    forward_cmd = [adb_cmd]
-    if target:
-        forward_cmd.extend(["-s", target])
-    forward_cmd.extend(["forward", "tcp:9222", "localabstract:chrome_devtools_remote"])
-    
+
+def _format_cdp_string(arg: dict) -> str:
+    val = arg.get("value")
+    return val if val is not None else str(arg)
+
+
+def _format_cdp_object(arg: dict) -> str:
+    val = arg.get("value")
+    if val is not None:
+        return str(val)
+    desc = arg.get("description")
+    if desc is not None:
+        return desc
+    return arg.get("className", "[object]")
+
+
+# Runtime.RemoteObject type -> formatter for console.* arguments; other types
+# print their value, or the raw object when there is none.
+_CDP_ARG_FORMATTERS = {
+    "string": _format_cdp_string,
+    "object": _format_cdp_object,
+    "undefined": lambda arg: "undefined",
+}
+
+
+# Newer Chromium/WebView builds may reject WS connections based on Origin.
+# Best effort: suppress the Origin header entirely, or send a common origin.
+_CDP_ORIGIN_ATTEMPTS = (
+    ("no Origin", {"suppress_origin": True}),
+    ("Origin chrome://inspect", {"origin": "chrome://inspect"}),
+    ("Origin http://localhost:9222", {"origin": "http://localhost:9222"}),
+)
+
+
+def connect_cdp_websocket(ws_url: str):
+    """Open the DevTools websocket, trying every Origin variant concurrently.
+
+    A rejected handshake can take up to the 10 s timeout, so the attempts run
+    in parallel and the first accepted connection wins; later successes are
+    closed. Raises the last error if every variant is rejected.
+    """
+    def attempt(label, kwargs):
+        # websocket-client validates text frames as UTF-8 in pure Python; load_json
+        # rejects malformed input anyway, so skip that per-frame pass.
+        ws = websocket.create_connection(ws_url, timeout=10, skip_utf8_validation=True, **kwargs)
+        return label, ws
+
+    # Daemon threads rather than an executor: a losing handshake can run for
+    # the whole 10 s timeout, and must not hold up interpreter exit on Ctrl+C.
+    results: "queue.Queue[tuple]" = queue.Queue()
+    lock = threading.Lock()
+    claimed = threading.Event()
+
+    def race(label, kwargs):
+        try:
+            result = attempt(label, kwargs)
+        except Exception as e:
+            results.put((None, e))
+            return
+        with lock:
+            if not claimed.is_set():
+                results.put((result, None))
+                return
+        # Another variant already won; drop this connection.
+        try:
+            result[1].close()
+        except Exception:
+            pass
+
+    for label, kwargs in _CDP_ORIGIN_ATTEMPTS:
+        threading.Thread(target=race, args=(label, kwargs), daemon=True).start()
+
+    last_err: Optional[BaseException] = None
+    for _ in _CDP_ORIGIN_ATTEMPTS:
+        result, err = results.get()
+        if err is not None:
+            last_err = err
+            continue
+        with lock:
+            claimed.set()
+        # Successes queued before the claim are closed here; later ones by race().
+        while True:
+            try:
+                extra, _ = results.get_nowait()
+            except queue.Empty:
+                break
+            if extra is not None:
+                try:
+                    extra[1].close()
+                except Exception:
+                    pass
+        label, ws = result
+        print(f"[cdp] Connected to WebView DevTools ({label})", flush=True)
+        return ws
+    raise last_err if last_err is not None else RuntimeError("CDP websocket connect failed")
+
+
+def forward_devtools_port(adb_cmd: str, cwd: Path, target: Optional[str]) -> bool:
+    """Forward localhost:9222 to the device's DevTools socket; return False on failure."""
     try:
-        subprocess.run(
-            forward_cmd,
+        result = subprocess.run(
+            adb_args(adb_cmd, target)
+            + ["forward", "tcp:9222", "localabstract:chrome_devtools_remote"],
             cwd=cwd,
             check=False,
             capture_output=True,
@@ -256,81 +590,65 @@ def start_cdp_console_stream(adb_cmd: str, cwd: Path, target: Optional[str]):
         )
     except subprocess.TimeoutExpired:
         print("Warning: adb forward timed out (CDP).", flush=True)
-        return None
+        return False
     except OSError:
         print("Warning: Failed to set up CDP port forwarding.")
+        return False
+    if result.returncode != 0:
+        err = result.stderr.decode("utf-8", errors="replace").strip()
+        print(f"Warning: Failed to set up CDP port forwarding: {err or f'exit code {result.returncode}'}", flush=True)
+        return False
+    return True
+
+
+def start_cdp_console_stream():
+    """Start streaming console logs via Chrome DevTools Protocol.
+
+    Expects tcp:9222 to be forwarded already (see forward_devtools_port).
+    """
+    if not HAS_WEBSOCKET:
+        print("Warning: websocket-client not installed. Run: pip install websocket-client")
         return None
 
     def cdp_pump():
         ws = None
-        retry_count = 0
-        max_retries = 30  # Wait up to 30 seconds for WebView to be ready
-        
-        while retry_count < max_retries:
+        # Wait up to 30 seconds for WebView to be ready. A deadline rather than an
+        # attempt count, since each /json request can itself take up to 5 s.
+        deadline = time.monotonic() + 30
+        while True:
             ws_url = get_cdp_websocket_url()
             if ws_url:
                 break
-            retry_count += 1
-            time.sleep(1)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(1.0, remaining))
         
         if not ws_url:
             print("[cdp] Warning: Could not connect to WebView DevTools. Console logs unavailable.")
             return
 
         try:
-            # Newer Chromium/WebView builds may reject WS connections based on Origin.
-            # Best effort: suppress Origin header entirely, then try common origins.
-            last_err: Optional[Exception] = None
-
-            try:
-                ws = websocket.create_connection(
-                    ws_url,
-                    timeout=10,
-                    suppress_origin=True,
-                )
-                print("[cdp] Connected to WebView DevTools (no Origin)", flush=True)
-            except Exception as e:
-                last_err = e
-                ws = None
-
-            if ws is None:
-                try:
-                    ws = websocket.create_connection(
-                        ws_url,
-                        timeout=10,
-                        origin="chrome://inspect",
-                    )
-                    print("[cdp] Connected to WebView DevTools (Origin chrome://inspect)", flush=True)
-                except Exception as e:
-                    last_err = e
-                    ws = None
-
-            if ws is None:
-                try:
-                    ws = websocket.create_connection(
-                        ws_url,
-                        timeout=10,
-                        origin="http://localhost:9222",
-                    )
-                    print("[cdp] Connected to WebView DevTools (Origin http://localhost:9222)", flush=True)
-                except Exception as e:
-                    last_err = e
-                    ws = None
-
-            if ws is None:
-                raise last_err if last_err is not None else RuntimeError("CDP websocket connect failed")
+            ws = connect_cdp_websocket(ws_url)
             
             # Enable Runtime to receive console messages
-            ws.send(json.dumps({"id": 1, "method": "Runtime.enable"}))
+            ws.send(dump_json({"id": 1, "method": "Runtime.enable"}))
             # Also enable Log domain for additional messages
-            ws.send(json.dumps({"id": 2, "method": "Log.enable"}))
+            ws.send(dump_json({"id": 2, "method": "Log.enable"}))
             
+            data_opcodes = (websocket.ABNF.OPCODE_TEXT, websocket.ABNF.OPCODE_BINARY)
             while True:
                 try:
-                    msg = ws.recv()
-                    if not msg:
+                    # Raw frame payload: load_json parses the UTF-8 bytes directly,
+                    # skipping recv()'s intermediate str decode.
+                    opcode, msg = ws.recv_data()
+                    if opcode not in data_opcodes or not msg:
+                        continue
+                    # Command replies and other events (e.g. executionContextCreated)
+                    # are never printed; skip them before building a dict per frame.
+                    if b'"Runtime.consoleAPICalled"' not in msg and b'"Log.entryAdded"' not in msg:
                         continue
-                    data = json.loads(msg)
+                    data = load_json(msg)
                     method = data.get("method", "")
                     
                     if method == "Runtime.consoleAPICalled":
@@ -339,20 +657,10 @@ def start_cdp_console_stream(adb_cmd: str, cwd: Path, target: Optional[str]):
                         args = params.get("args", [])
                         
                         # Format the log message
-                        parts = []
-                        for arg in args:
-                            val = arg.get("value")
-                            if val is not None:
-                                parts.append(str(val))
-                            elif arg.get("type") == "object":
-                                desc = arg.get("description", arg.get("className", "[object]"))
-                                parts.append(desc)
-                            elif arg.get("type") == "undefined":
-                                parts.append("undefined")
-                            else:
-                                parts.append(str(arg))
-                        
-                        message = " ".join(parts)
+                        message = " ".join(
+                            _CDP_ARG_FORMATTERS.get(arg.get("type"), _format_cdp_value)(arg)
+                            for arg in args
+                        )
                         prefix = f"[console.{log_type}]"
                         print(f"{prefix} {message}", flush=True)
                     
@@ -389,7 +697,6 @@ def list_adb_devices(adb_cmd: str, cwd: Path):
             cwd=cwd,
             check=False,
             capture_output=True,
-            text=True,
             timeout=10,
         )
     except subprocess.TimeoutExpired:
@@ -402,19 +709,16 @@ def list_adb_devices(adb_cmd: str, cwd: Path):
     except OSError:
         return []
 
+    # "SERIAL<TAB>STATE" per device. Work on the raw bytes and only decode the
+    # serials we keep; the "List of devices attached" header and blank lines
+    # fall out of the state check.
     devices = []
     for line in result.stdout.splitlines():
-        line = line.strip()
-        if not line or line.startswith("List of devices"):
-            continue
-        parts = line.split()
-        if len(parts) < 2:
+        parts = line.split(None, 2)
+        if len(parts) < 2 or parts[1] != b"device":
             continue
-        serial, state = parts[0], parts[1]
-        if state != "device":
-            continue
-        is_emulator = serial.startswith("emulator-")
-        devices.append((serial, is_emulator))
+        serial = parts[0].decode("ascii", errors="replace")
+        devices.append((serial, serial.startswith("emulator-")))
     return devices
 
 
@@ -438,7 +742,7 @@ def start_logcat(
     tags: Optional[str],
     all_logs: bool,
 ):
-    if not shutil.which(adb_cmd):
+    if not _which(adb_cmd):
         print("Warning: adb not found in PATH. Logcat disabled.")
         return None
 
@@ -457,10 +761,6 @@ def start_logcat(
             cwd=cwd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            encoding="utf-8",
-            errors="replace",
         )
     except OSError:
         print("Warning: failed to start adb logcat.")
@@ -575,14 +875,14 @@ def run():
     npx_cmd = resolve_cmd("npx")
     adb_cmd = resolve_cmd("adb")
 
-    if not shutil.which(npm_cmd):
+    if not _which(npm_cmd):
         print("Error: npm not found in PATH.")
         return 2
-    if not shutil.which(npx_cmd):
+    if not _which(npx_cmd):
         print("Error: npx not found in PATH.")
         return 2
 
-    adb_available = shutil.which(adb_cmd) is not None
+    adb_available = _which(adb_cmd) is not None
     target = args.target
     if adb_available and args.adb_wireless:
         pair_target = None
@@ -629,18 +929,12 @@ def run():
     elif not adb_available:
         print("Warning: adb not found in PATH. Device detection may fail.")
 
-    # Setup Chrome DevTools port forwarding for remote debugging (opt-in)
+    # Setup Chrome DevTools port forwarding for remote debugging (opt-in). Done
+    # before cap run so chrome://inspect works as soon as the app starts; the
+    # CDP console stream below reuses this forward.
+    devtools_forwarded = False
     if adb_available and args.devtools:
-        try:
-            # Forward Chrome DevTools debugging port
-            subprocess.run(
-                [adb_cmd, "forward", "tcp:9222", "localabstract:chrome_devtools_remote"],
-                cwd=project_root,
-                check=False,
-                capture_output=True,
-            )
-        except OSError:
-            pass
+        devtools_forwarded = forward_devtools_port(adb_cmd, project_root, target)
 
     # target already resolved above
     app_id = args.app_id or read_app_id(project_root)
@@ -664,18 +958,27 @@ def run():
         cwd=project_root,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
     )
     stream_output(dev_proc, "[dev] ")
     logcat_proc = None
     app_pid_holder = None
+    shutting_down = threading.Event()
 
     try:
-        print(f"Waiting for Vite on 127.0.0.1:{chosen_port}...", flush=True)
-        ready = wait_for_port("127.0.0.1", chosen_port, timeout_s=30)
-        if not ready:
-            print("Warning: dev server not ready yet, continuing anyway.")
+        # cap sync/run do not need the dev server (the app only loads the URL once
+        # it is installed), so wait for Vite in the background and let it gate the
+        # "running" banner instead of the native build.
+        # Vite is started with --host 0.0.0.0 (IPv4 only), so probe 127.0.0.1
+        # directly rather than also trying ::1 for "localhost".
+        print(f"Waiting for Vite on 127.0.0.1:{chosen_port} (in background)...", flush=True)
+        vite_ready = {"ready": False}
+        vite_waited = threading.Event()
+
+        def wait_for_vite():
+            vite_ready["ready"] = wait_for_port("127.0.0.1", chosen_port, timeout_s=30)
+            vite_waited.set()
+
+        threading.Thread(target=wait_for_vite, daemon=True).start()
 
         if args.logcat:
             if logcat_mode == "app" and not app_id:
@@ -684,12 +987,13 @@ def run():
                 logcat_all = True
 
             app_pid_holder = {"pid": None}
-            
-            # Clear logcat buffer to avoid showing old logs
-            try:
-                subprocess.run([adb_cmd, "logcat", "-c"], cwd=project_root, check=False)
-            except OSError:
-                pass
+
+            # Clear logcat buffer to avoid showing old logs. App mode also needs an
+            # empty events buffer for wait_for_pid; clear both in one round trip.
+            clear_cmds = [["logcat", "-c"]]
+            if logcat_mode == "app":
+                clear_cmds.append(["logcat", "-b", "events", "-c"])
+            adb_shell_batch(adb_cmd, project_root, target, clear_cmds)
 
             print("Starting adb logcat...", flush=True)
             logcat_proc = start_logcat(
@@ -751,8 +1055,6 @@ def run():
             cwd=project_root,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
         )
         stream_output(cap_proc, "[cap] ")
 
@@ -767,7 +1069,12 @@ def run():
                 print("Waiting for app process for logcat (app mode)...", flush=True)
                 try:
                     app_pid_holder["pid"] = wait_for_pid(
-                        adb_cmd, project_root, app_id, timeout_s=60
+                        adb_cmd,
+                        project_root,
+                        app_id,
+                        timeout_s=60,
+                        target=target,
+                        clear_events=False,
                     )
                 except KeyboardInterrupt:
                     # Some terminals can send a spurious interrupt; don't kill the wrapper.
@@ -780,38 +1087,33 @@ def run():
         # CDP console capture is opt-in (use --devtools). Default is to rely on the
         # Vite /__console forwarder for terminal logs.
         cdp_thread = None
-        if adb_available and args.devtools:
+        if devtools_forwarded:
             print("Starting Chrome DevTools Protocol console capture...", flush=True)
-            cdp_thread = start_cdp_console_stream(adb_cmd, project_root, target)
+            cdp_thread = start_cdp_console_stream()
+
+        wait_event(vite_waited)
+        if not vite_ready["ready"]:
+            print("Warning: dev server not ready yet, continuing anyway.")
 
         print(
             "Live reload running. Logs will appear here (Ctrl+C to stop).",
             flush=True,
         )
+        # Some Capacitor versions/flags return immediately even though the app
+        # is deployed and live reload keeps working. Don't exit the wrapper
+        # process just because `cap run` ended.
+        # On Windows, `npm` can sometimes exit while leaving the underlying
+        # dev server process running. Never auto-exit the wrapper.
+        # Watcher threads block in wait() and only report the exit.
+        watch_exit(cap_proc, "[cap] ", shutting_down)
+        watch_exit(dev_proc, "[dev] ", shutting_down)
         try:
-            while True:
-                # Some Capacitor versions/flags return immediately even though the app
-                # is deployed and live reload keeps working. Don't exit the wrapper
-                # process just because `cap run` ended.
-                if cap_proc is not None and cap_proc.poll() is not None:
-                    print(
-                        f"[cap] process exited with code {cap_proc.returncode}; keeping wrapper alive.",
-                        flush=True,
-                    )
-                    cap_proc = None
-
-                # On Windows, `npm` can sometimes exit while leaving the underlying
-                # dev server process running. Never auto-exit the wrapper.
-                if dev_proc is not None and dev_proc.poll() is not None:
-                    print(
-                        f"[dev] process exited with code {dev_proc.returncode}; keeping wrapper alive.",
-                        flush=True,
-                    )
-                    dev_proc = None
-                time.sleep(0.5)
+            # Nothing else to do until Ctrl+C; no polling loop (see wait_event).
+            wait_event(shutting_down)
         except KeyboardInterrupt:
             return 0
     finally:
+        shutting_down.set()
         if logcat_proc and logcat_proc.poll() is None:
             logcat_proc.terminate()
             try: